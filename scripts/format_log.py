@@ -1,96 +1,267 @@
 #!/usr/bin/env python3
 
 import json
+import re
 import sys
 import argparse
 import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 import time
 import signal
+import threading
 import termios
 import tty
-import glob
-from pathlib import Path
+import zlib
+
+# orjson parses JSONL lines ~5x faster than stdlib json and accepts bytes
+# directly, skipping the utf-8 decode step. Fall back to stdlib if missing.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# inotify lets the follow loop sleep until the kernel reports file
+# activity instead of polling at 10Hz. Optional; Linux only.
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+# ciso8601 parses ISO 8601 timestamps several times faster than
+# datetime.fromisoformat and handles the trailing 'Z' natively.
+try:
+    import ciso8601
+    _parse_iso = ciso8601.parse_datetime
+except ImportError:
+    _parse_iso = None
+
+# GMT+8 offset, hoisted so the hot paths don't rebuild it per call
+_GMT8 = timedelta(hours=8)
+
+def _parse_timestamp(timestamp_str: object) -> 'datetime | None':
+    """Parse an ISO 8601 timestamp string, returning None on failure.
+
+    A cheap shape check on the date separators rejects non-ISO values
+    (epoch numbers, unhashable JSON objects, free text) before reaching
+    the cache, which only ever sees plausible strings.
+    """
+    if not isinstance(timestamp_str, str) or len(timestamp_str) < 19:
+        return None
+    if timestamp_str[4] != '-' or timestamp_str[7] != '-' or timestamp_str[10] not in ('T', ' '):
+        return None
+    return _parse_timestamp_cached(timestamp_str)
 
-def convert_timestamp(timestamp_str):
-    """Convert ISO 8601 timestamp to HH:MM:SS format with GMT+8 adjustment"""
+@lru_cache(maxsize=4096)
+def _parse_timestamp_cached(timestamp_str: str) -> 'datetime | None':
+    # Cache shared by the display and summary paths; callers go through
+    # _parse_timestamp so only hashable, shape-checked strings land here
     try:
-        # Parse the timestamp string (assuming ISO 8601 format)
-        dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        # Add 8 hours for GMT+8
-        dt_gmt8 = dt + timedelta(hours=8)
-        return dt_gmt8.strftime('%H:%M:%S')
-    except Exception:
-        # If parsing fails, return original timestamp
+        if _parse_iso is not None:
+            return _parse_iso(timestamp_str)
+        if timestamp_str.endswith('Z'):
+            return datetime.fromisoformat(timestamp_str[:-1] + '+00:00')
+        return datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        return None
+
+def convert_timestamp(timestamp_str: object) -> object:
+    """Convert ISO 8601 timestamp to HH:MM:SS format with GMT+8 adjustment"""
+    # Type-check before touching the cache: a non-string timestamp value
+    # (e.g. {"$date": ...}) must pass through unchanged like any other
+    # unparseable timestamp, not blow up on hashing
+    if not isinstance(timestamp_str, str):
         return timestamp_str
+    return _convert_timestamp_cached(timestamp_str)
+
+@lru_cache(maxsize=4096)
+def _convert_timestamp_cached(timestamp_str: str) -> str:
+    # Fast path: for UTC timestamps only the hour changes, so add 8 mod
+    # 24 to the hour digits and reuse the :MM:SS text - no datetime,
+    # timedelta, or strftime objects at all
+    if (len(timestamp_str) >= 19
+            and timestamp_str[10] == 'T' and timestamp_str[13] == ':'
+            and timestamp_str[16] == ':'
+            and (timestamp_str.endswith('Z') or timestamp_str.endswith('+00:00'))):
+        hh = timestamp_str[11:13]
+        mm = timestamp_str[14:16]
+        ss = timestamp_str[17:19]
+        # Only shortcut in-range fields; anything else falls through to
+        # the validated parser so an invalid timestamp keeps the
+        # return-original contract instead of being silently mangled
+        if (hh.isdigit() and mm.isdigit() and ss.isdigit()
+                and hh < '24' and mm < '60' and ss < '60'):
+            try:
+                hour = (int(hh) + 8) % 24
+                return f"{hour:02d}{timestamp_str[13:19]}"
+            except ValueError:
+                pass
 
-def get_color_code(field_name):
+    dt = _parse_timestamp(timestamp_str)
+    if dt is None:
+        # If parsing fails, return original timestamp
+        return timestamp_str
+    # Add 8 hours for GMT+8
+    return (dt + _GMT8).strftime('%H:%M:%S')
+
+_COLORS = (
+    '\033[31m',  # Red
+    '\033[32m',  # Green
+    '\033[33m',  # Yellow
+    '\033[34m',  # Blue
+    '\033[35m',  # Magenta
+    '\033[36m',  # Cyan
+    '\033[91m',  # Bright Red
+    '\033[92m',  # Bright Green
+    '\033[93m',  # Bright Yellow
+    '\033[94m',  # Bright Blue
+    '\033[95m',  # Bright Magenta
+    '\033[96m',  # Bright Cyan
+    '\033[97m',  # White
+)
+
+@lru_cache(maxsize=1024)
+def get_color_code(field_name: str) -> str:
     """Generate a consistent color code based on field name"""
     if not field_name:
         return ''
 
-    # Hash the field name to get a consistent color assignment
-    hash_val = 0
-    for char in field_name:
-        hash_val = (hash_val * 31 + ord(char)) & 0x7FFFFFFF
-
-    # Use modulo to get a color from predefined list
-    colors = [
-        '\033[31m',  # Red
-        '\033[32m',  # Green
-        '\033[33m',  # Yellow
-        '\033[34m',  # Blue
-        '\033[35m',  # Magenta
-        '\033[36m',  # Cyan
-        '\033[91m',  # Bright Red
-        '\033[92m',  # Bright Green
-        '\033[93m',  # Bright Yellow
-        '\033[94m',  # Bright Blue
-        '\033[95m',  # Bright Magenta
-        '\033[96m',  # Bright Cyan
-        '\033[97m',  # White
-    ]
-    return colors[hash_val % len(colors)]
-
-def print_nested_fields(obj, indent_level=1):
-    """Recursively print nested fields with proper indentation"""
-    indent = "  " * indent_level
-
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            color = get_color_code(key)
-            if isinstance(value, dict):
-                print(f"{indent}{color}{key}:\033[0m")  # Print the key without {...}
-                print_nested_fields(value, indent_level + 1)  # Recursively print nested content
-            elif isinstance(value, list):
-                print(f"{indent}{color}{key}:\033[0m")  # Print the key without [...]
-                # Print list items if they're simple values or objects
-                for i, item in enumerate(value):
-                    item_indent = "  " * (indent_level + 1)
-                    if isinstance(item, dict):
-                        print(f"{item_indent}[{i}]:")
-                        print_nested_fields(item, indent_level + 2)
+    # crc32 runs the hash loop in C and is stable across runs, so the
+    # same field keeps the same color between invocations
+    hash_val = zlib.crc32(field_name.encode('utf-8'))
+    return _COLORS[hash_val % len(_COLORS)]
+
+@lru_cache(maxsize=1024)
+def _key_prefix(key: str) -> str:
+    """Colored "key:" prefix, built once per distinct field name"""
+    return f"{get_color_code(key)}{key}:\033[0m"
+
+_ESC_RE = re.compile(r'\\n|\\t|\\"')
+_ESC_MAP = {'\\n': ' ', '\\t': '    ', '\\"': '"'}
+
+def _unescape(value: str) -> str:
+    """Clean up literal \\n/\\t/\\\" escapes in a single pass over the string"""
+    if '\\' not in value:
+        # Fast path: nothing to substitute
+        return value
+    return _ESC_RE.sub(lambda m: _ESC_MAP[m.group(0)], value)
+
+# Precomputed indent strings so the hot path does a tuple lookup instead
+# of allocating "  " * level per field
+_INDENTS = tuple("  " * i for i in range(16))
+
+def _indent(level: int) -> str:
+    return _INDENTS[level] if level < len(_INDENTS) else "  " * level
+
+# Per-type field emitters. Dispatching on type(value) through a dict is a
+# single hash lookup instead of an isinstance ladder per field.
+
+def _emit_dict(key: str, value: dict, indent_level: int, out: 'list[str]') -> None:
+    # Print the key without {...}, then the nested content
+    out.append(_indent(indent_level) + _key_prefix(key) + '\n')
+    print_nested_fields(value, indent_level + 1, out)
+
+def _emit_list(key: str, value: list, indent_level: int, out: 'list[str]') -> None:
+    # Print the key without [...], then list items if they're simple
+    # values or objects
+    out.append(_indent(indent_level) + _key_prefix(key) + '\n')
+    item_indent = _indent(indent_level + 1)
+    for i, item in enumerate(value):
+        if type(item) is dict:
+            out.append(f"{item_indent}[{i}]:\n")
+            print_nested_fields(item, indent_level + 2, out)
+        else:
+            out.append(f"{item_indent}[{i}]: {item}\n")
+
+def _emit_str(key: str, value: str, indent_level: int, out: 'list[str]') -> None:
+    # Handle escaped strings in content
+    out.append(_indent(indent_level) + _key_prefix(key) + ' ' + _unescape(value) + '\n')
+
+def _emit_prim(key: str, value: object, indent_level: int, out: 'list[str]') -> None:
+    # Primitive types (int, float, boolean, None, ...)
+    out.append(f"{_indent(indent_level)}{_key_prefix(key)} {value}\n")
+
+_HANDLERS = {
+    dict: _emit_dict,
+    list: _emit_list,
+    str: _emit_str,
+    int: _emit_prim,
+    float: _emit_prim,
+    bool: _emit_prim,
+    type(None): _emit_prim,
+}
+
+def print_nested_fields(obj: object, indent_level: int = 1, out: 'list[str] | None' = None) -> None:
+    """Recursively format nested fields with proper indentation.
+
+    Lines are appended to the `out` accumulator; when called without one,
+    the buffered output is written to stdout in a single call.
+    """
+    if out is None:
+        out = []
+        print_nested_fields(obj, indent_level, out)
+        sys.stdout.write(''.join(out))
+        return
+
+    # Explicit work stack instead of recursion: no call-frame setup per
+    # nested object and no RecursionError on deep tool-call traces.
+    # Items are ('line', text) for finished lines and ('obj', value,
+    # level) for containers still to expand; children are pushed in
+    # reverse so output order matches the recursive version.
+    stack = [('obj', obj, indent_level)]
+    while stack:
+        item = stack.pop()
+        if item[0] == 'line':
+            out.append(item[1])
+            continue
+
+        _, cur, level = item
+        if isinstance(cur, dict):
+            # Most nested objects are flat (all-scalar values); format
+            # those with a tight loop and no stack traffic
+            if not any(type(v) in (dict, list) for v in cur.values()):
+                indent = _indent(level)
+                for key, value in cur.items():
+                    if type(value) is str:
+                        out.append(indent + _key_prefix(key) + ' ' + _unescape(value) + '\n')
                     else:
-                        print(f"{item_indent}[{i}]: {item}")
-            elif isinstance(value, str):
-                # Handle escaped strings in content
-                processed_value = value.replace('\\n', ' ').replace('\\t', '    ').replace('\\"', '"')
-                print(f"{indent}{color}{key}:\033[0m {processed_value}")
-            else:
-                print(f"{indent}{color}{key}:\033[0m {value}")
-    elif isinstance(obj, list):
-        for i, item in enumerate(obj):
-            item_indent = "  " * indent_level
-            if isinstance(item, dict):
-                print(f"{item_indent}[{i}]:")
-                print_nested_fields(item, indent_level + 1)
-            else:
-                print(f"{item_indent}[{i}]: {item}")
+                        out.append(f"{indent}{_key_prefix(key)} {value}\n")
+                continue
+
+            indent = _indent(level)
+            for key, value in reversed(list(cur.items())):
+                t = type(value)
+                if t is dict or t is list:
+                    # Key header first, nested content after
+                    stack.append(('obj', value, level + 1))
+                    stack.append(('line', indent + _key_prefix(key) + '\n'))
+                elif t is str:
+                    stack.append(('line', indent + _key_prefix(key) + ' ' + _unescape(value) + '\n'))
+                else:
+                    stack.append(('line', f"{indent}{_key_prefix(key)} {value}\n"))
+        elif isinstance(cur, list):
+            item_indent = _indent(level)
+            for i in range(len(cur) - 1, -1, -1):
+                value = cur[i]
+                if type(value) is dict:
+                    stack.append(('obj', value, level + 1))
+                    stack.append(('line', f"{item_indent}[{i}]:\n"))
+                else:
+                    stack.append(('line', f"{item_indent}[{i}]: {value}\n"))
 
-def format_log_entry(json_obj):
-    """Format and print a log entry"""
-    # Print a blank line before each log entry
-    print()
+# Entry-header templates, prebuilt so the hot path runs a C-level
+# str.format instead of assembling a fresh f-string per entry
+_HDR_BOTH = "\033[36m[{t}]\033[0m {c}[{ty}]\033[0m\n"
+_HDR_TIME_ONLY = "\033[36m[{t}]\033[0m \033[33m[unknown-type]\033[0m\n"
+_HDR_TYPE_ONLY = "\033[33m[No timestamp]\033[0m {c}[{ty}]\033[0m\n"
+_HDR_NONE = "\033[33m[No timestamp or type]\033[0m\n"
+
+def format_log_entry(json_obj: dict) -> None:
+    """Format and print a log entry as one buffered stdout write"""
+    # Accumulate the whole entry and emit it with a single write call
+    # instead of one print (and flush) per field
+    out = ['\n']  # Blank line before each log entry
 
     timestamp = json_obj.get('timestamp', json_obj.get('time', None))
     entry_type = json_obj.get('type', None)
@@ -102,52 +273,69 @@ def format_log_entry(json_obj):
 
     # Print the header with timestamp and type
     if formatted_time and entry_type:
-        print(f"\033[36m[{formatted_time}]\033[0m {get_color_code(entry_type)}[{entry_type}]\033[0m")
+        out.append(_HDR_BOTH.format(t=formatted_time, c=get_color_code(entry_type), ty=entry_type))
     elif formatted_time:
-        print(f"\033[36m[{formatted_time}]\033[0m \033[33m[unknown-type]\033[0m")
+        out.append(_HDR_TIME_ONLY.format(t=formatted_time))
     elif entry_type:
-        print(f"\033[33m[No timestamp]\033[0m {get_color_code(entry_type)}[{entry_type}]\033[0m")
+        out.append(_HDR_TYPE_ONLY.format(c=get_color_code(entry_type), ty=entry_type))
     else:
-        print("\033[33m[No timestamp or type]\033[0m")
+        out.append(_HDR_NONE)
 
     # Print all fields, handling special cases for log formats
+    handlers = _HANDLERS
     for key, value in json_obj.items():
-        if key in ['timestamp', 'type', 'time']:  # Also exclude 'time' if it's duplicate
+        if key in ('timestamp', 'type', 'time'):  # Also exclude 'time' if it's duplicate
             continue
 
-        if isinstance(value, dict):
-            # For nested objects, print the field name and then expand its contents fully
-            color = get_color_code(key)
-            print(f"  {color}{key}:\033[0m")
-            print_nested_fields(value, 2)  # Just print the nested content, no "{...}"
-        elif isinstance(value, list):
-            # For arrays, print the field name and then expand its contents
-            color = get_color_code(key)
-            print(f"  {color}{key}:\033[0m")
-            for i, item in enumerate(value):
-                item_indent = "  " * 2
-                if isinstance(item, dict):
-                    print(f"{item_indent}[{i}]:")
-                    print_nested_fields(item, 3)
-                else:
-                    print(f"{item_indent}[{i}]: {item}")
-        elif isinstance(value, str):
-            # Determine appropriate color for the field
-            color = get_color_code(key)
-
-            # Special handling for the "0" field (first argument in logging libraries)
-            if key == "0":
-                # This is often the main log message
-                processed_value = value.replace('\\n', ' ').replace('\\t', '    ').replace('\\"', '"')
-                print(f"  {color}message:\033[0m {processed_value}")
-            else:
-                # Handle escaped strings in content
-                processed_value = value.replace('\\n', ' ').replace('\\t', '    ').replace('\\"', '"')
-                print(f"  {color}{key}:\033[0m {processed_value}")
+        # Special handling for the "0" field (first argument in logging
+        # libraries) - it's often the main log message
+        if key == "0" and type(value) is str:
+            out.append(f"  {get_color_code(key)}message:\033[0m {_unescape(value)}\n")
         else:
-            # For primitive types (int, float, boolean, etc.)
-            color = get_color_code(key)
-            print(f"  {color}{key}:\033[0m {value}")
+            handlers.get(type(value), _emit_prim)(key, value, 1, out)
+
+    sys.stdout.write(''.join(out))
+
+def _iter_files_with_mtime(root, suffix=None):
+    """Walk a directory tree with os.scandir, yielding (path, mtime) tuples.
+
+    DirEntry reuses metadata gathered while reading each directory, so
+    this avoids the extra stat-per-file that rglob + stat() incurs.
+    Optionally filter by filename suffix (e.g. '.jsonl').
+    """
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            if suffix is None or entry.name.endswith(suffix):
+                                yield entry.path, entry.stat().st_mtime
+                    except OSError:
+                        # Entry disappeared mid-walk; skip it
+                        continue
+        except OSError:
+            # Directory unreadable or removed; skip it
+            continue
+
+
+def _latest_file(root, suffix=None):
+    """Find the most recently modified file under root in a single pass.
+
+    Tracks the running argmax while the walk streams, so no file list is
+    materialized. Returns (path, mtime), or (None, -1.0) when empty.
+    """
+    best_path = None
+    best_mtime = -1.0
+    for path, mtime in _iter_files_with_mtime(root, suffix):
+        if mtime > best_mtime:
+            best_path, best_mtime = path, mtime
+    return best_path, best_mtime
+
 
 def find_latest_file(directory_path=None):
     """Find the latest modified file in the given directory, or auto-detect Qwen project dir"""
@@ -157,19 +345,14 @@ def find_latest_file(directory_path=None):
         if directory_path is None:
             raise FileNotFoundError("Cannot find Qwen project directory. Please specify a path.")
 
-    directory = Path(directory_path)
-
-    # Find all files in the directory (including subdirectories)
-    files = [f for f in directory.rglob('*') if f.is_file()]
+    # Newest file in the directory (including subdirectories)
+    latest_file, _ = _latest_file(directory_path)
 
-    if not files:
+    if latest_file is None:
         raise FileNotFoundError(f"No files found in directory: {directory_path}")
 
-    # Sort files by modification time, newest first
-    latest_file = max(files, key=lambda f: f.stat().st_mtime)
-
     print(f"Using latest file: {latest_file}")
-    return str(latest_file)
+    return latest_file
 
 
 def find_qwen_project_dir():
@@ -178,64 +361,89 @@ def find_qwen_project_dir():
     Returns the projects directory itself so that all subdirectories
     can be monitored for the latest .jsonl files.
     """
-    home = Path.home()
-    projects_dir = home / ".qwen" / "projects"
+    projects_dir = os.path.join(os.path.expanduser('~'), '.qwen', 'projects')
 
-    if not projects_dir.is_dir():
+    if not os.path.isdir(projects_dir):
         return None
 
     # Check if there are any .jsonl files in projects_dir or subdirectories
-    jsonl_files = list(projects_dir.rglob("*.jsonl"))
-    if not jsonl_files:
+    if next(_iter_files_with_mtime(projects_dir, '.jsonl'), None) is None:
         return None
 
     # Return the projects directory itself, not a specific subdirectory
     # This allows tail_follow to monitor all .jsonl files in all subdirectories
     return projects_dir
 
-def find_next_timestamp_index(lines, start_index):
-    """Find the next line that contains a log entry with a timestamp"""
-    for i in range(start_index, len(lines)):
+def find_next_timestamp_entry(f):
+    """Advance the file to the next log entry with a timestamp.
+
+    Returns the parsed entry so the caller can display it without parsing
+    the line a second time, or None if the end of the file is reached.
+    """
+    for line in f:
+        # Cheap bytes containment test first - lines without any of the
+        # marker keys are rejected without paying for a JSON parse
+        if b'"timestamp"' not in line and b'"time"' not in line and b'"type"' not in line:
+            continue
         try:
-            json_obj = json.loads(lines[i].strip())
+            json_obj = _loads(line)
             # Look for timestamp field (or time for different log formats)
             if 'timestamp' in json_obj or 'time' in json_obj or 'type' in json_obj:
-                return i
-        except json.JSONDecodeError:
+                return json_obj
+        except ValueError:
             # Skip non-JSON lines
             continue
-    return len(lines)  # Return end of file if not found
+    return None  # End of file
 
-def get_log_summary(lines):
-    """Extract log summary information"""
-    total_events = 0
-    timestamps = []
+# Pulls the timestamp (or time) value straight out of the raw line so the
+# summary pass doesn't need to JSON-decode every record
+_TS_RE = re.compile(rb'"(?:timestamp|time)"\s*:\s*"([^"]+)"')
 
-    for line in lines:
-        try:
-            json_obj = json.loads(line.strip())
-            # Look for timestamp field (or time for different log formats)
-            timestamp = json_obj.get('timestamp') or json_obj.get('time')
-            if timestamp:
-                try:
-                    # Validate that it's a proper timestamp
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    timestamps.append(dt)
-                except ValueError:
-                    # Skip invalid timestamps
-                    pass
-            total_events += 1
-        except json.JSONDecodeError:
-            # Count non-JSON lines as well
-            total_events += 1
-
-    start_time = None
-    end_time = None
+def get_log_summary(file_path, lines_per_page=20):
+    """Extract log summary information in a single streaming pass.
 
-    if timestamps:
-        start_time = min(timestamps)
-        end_time = max(timestamps)
+    The summary only needs the event count and min/max timestamps, so
+    each line is scanned with a byte-level regex instead of a full JSON
+    parse - the parser doesn't run at all before the first page shows.
+    """
+    line_count = 0
+    min_ts = None
+    max_ts = None
 
+    with open(file_path, 'rb') as f:
+        for line in f:
+            line_count += 1
+            # Look for timestamp field (or time for different log formats)
+            match = _TS_RE.search(line)
+            if match:
+                # Track min/max as raw bytes - lexicographic order matches
+                # chronological order for uniformly formatted ISO 8601, so
+                # no per-line datetime objects are built
+                ts = match.group(1)
+                # Cheap shape check before a candidate can win min/max -
+                # the regex also matches non-ISO "time" values, and one
+                # malformed winner would turn the whole range into N/A
+                if (len(ts) < 19 or not ts[:4].isdigit()
+                        or ts[4:5] != b'-' or ts[7:8] != b'-'
+                        or ts[10:11] not in (b'T', b' ')):
+                    continue
+                if min_ts is None:
+                    min_ts = max_ts = ts
+                elif ts < min_ts:
+                    min_ts = ts
+                elif ts > max_ts:
+                    max_ts = ts
+
+    # Every line counts as an event, JSON or not, matching the display pass
+    total_events = line_count
+
+    # Parse just the two winners, validating them as proper timestamps
+    start_time = end_time = None
+    if min_ts is not None:
+        start_time = _parse_timestamp(min_ts.decode('utf-8', errors='replace'))
+        end_time = _parse_timestamp(max_ts.decode('utf-8', errors='replace'))
+
+    if start_time is not None and end_time is not None:
         # Convert to YYYY-MM-DD HH:MM:SS format with GMT+8
         start_time_gmt8 = start_time + timedelta(hours=8)
         end_time_gmt8 = end_time + timedelta(hours=8)
@@ -246,9 +454,7 @@ def get_log_summary(lines):
         start_str = "N/A"
         end_str = "N/A"
 
-    # Calculate total pages (lines_per_page = 20)
-    lines_per_page = 20
-    total_pages = (len(lines) + lines_per_page - 1) // lines_per_page  # Ceiling division
+    total_pages = (line_count + lines_per_page - 1) // lines_per_page  # Ceiling division
 
     return {
         'total_events': total_events,
@@ -257,10 +463,33 @@ def get_log_summary(lines):
         'total_pages': total_pages
     }
 
-def paginate_output(lines, lines_per_page=20):
-    """Display content with pagination - jump to next timestamp on Enter"""
-    # Get and display log summary first
-    summary = get_log_summary(lines)
+def paginate_output(file_path, lines_per_page=20):
+    """Display content with pagination - jump to next timestamp on Enter.
+
+    The file is streamed page by page so memory stays bounded regardless
+    of log size. The summary scan runs in a background thread while the
+    first page is parsed, overlapping the two startup passes.
+    """
+    summary_holder = {}
+    summary_thread = threading.Thread(
+        target=lambda: summary_holder.update(get_log_summary(file_path, lines_per_page)),
+        daemon=True)
+    summary_thread.start()
+
+    # Parse (but don't display yet) the first page while the summary
+    # scan runs; entries are kept as (parsed, raw) pairs
+    f = open(file_path, 'rb')
+    first_page = []
+    for line in f:
+        try:
+            first_page.append((_loads(line), None))
+        except ValueError:
+            first_page.append((None, line))
+        if len(first_page) >= lines_per_page:
+            break
+
+    summary_thread.join()
+    summary = summary_holder
     print("=" * 50)
     print(f"日志汇总:")
     print(f"  事件数: {summary['total_events']}")
@@ -270,91 +499,105 @@ def paginate_output(lines, lines_per_page=20):
     print("=" * 50)
     print()
 
-    # Wait for user input before continuing
-    print("按 'c' 继续查看日志内容，按 'q' 退出: ", end='', flush=True)
-
-    # Read a character from stdin
+    # Enter character-at-a-time mode once for the whole session instead of
+    # toggling termios around every keystroke. cbreak (not raw) keeps
+    # output post-processing and Ctrl+C working while paging.
     fd = sys.stdin.fileno()
     old_settings = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
     try:
-        tty.setraw(sys.stdin.fileno())
+        # Wait for user input before continuing
+        print("按 'c' 继续查看日志内容，按 'q' 退出: ", end='', flush=True)
         ch = sys.stdin.read(1)
+        print()  # New line after user input
+
+        if ch.lower() == 'q':
+            print("退出...")
+            return
+        elif ch.lower() != 'c':
+            # If user pressed any other key, still continue but inform them
+            print("继续...")
+
+        print("格式化输出日志内容...")
+        print("按空格键翻页，按回车键跳转到下一个时间戳，按 'q' 退出")
+        print("===========================================")
+
+        pending = first_page
+        with f:
+            while True:
+                # Display a page worth of lines
+                lines_displayed = 0
+
+                if pending:
+                    # First page was already parsed during the summary scan
+                    for json_obj, raw in pending:
+                        if json_obj is not None:
+                            format_log_entry(json_obj)
+                        else:
+                            print(f"📄 原始行: {raw.decode('utf-8', errors='replace').rstrip()}")
+                        lines_displayed += 1
+                    pending = None
+                else:
+                    for line in f:
+                        try:
+                            json_obj = _loads(line)
+                            format_log_entry(json_obj)
+                        except ValueError:
+                            # If it's not JSON, print as raw line
+                            print(f"📄 原始行: {line.decode('utf-8', errors='replace').rstrip()}")
+
+                        lines_displayed += 1
+                        if lines_displayed >= lines_per_page:
+                            break
+
+                if lines_displayed < lines_per_page:
+                    print("文件结束.")
+                    break
+
+                # Wait for user input
+                print("--More--(按空格键翻页，按回车键跳转到下一个时间戳，按 'q' 退出): ", end='', flush=True)
+                ch = sys.stdin.read(1)
+                print()  # New line after user input
+
+                if ch.lower() == 'q':
+                    print("退出...")
+                    break
+                elif ch == ' ':
+                    # Show next page (continue the normal flow)
+                    continue
+                elif ch == '\n' or ch == '\r':  # Enter key - jump to next timestamp
+                    next_obj = find_next_timestamp_entry(f)
+                    if next_obj is not None:
+                        # Display the entry the scanner already parsed
+                        format_log_entry(next_obj)
+                    else:
+                        print("文件结束.")
+                        break
+                else:
+                    # Any other key - continue normally
+                    continue
     finally:
+        # Always restore the terminal, including on Ctrl+C (idempotent
+        # close in case the paging loop already closed the file)
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        f.close()
 
-    print()  # New line after user input
-
-    if ch.lower() == 'q':
-        print("退出...")
-        return
-    elif ch.lower() != 'c':
-        # If user pressed any other key, still continue but inform them
-        print("继续...")
-
-    print("格式化输出日志内容...")
-    print("按空格键翻页，按回车键跳转到下一个时间戳，按 'q' 退出")
-    print("===========================================")
-
-    total_lines = len(lines)
-    current_line = 0
-
-    while current_line < total_lines:
-        # Display a page worth of lines
-        lines_displayed = 0
-
-        while current_line < total_lines and lines_displayed < lines_per_page:
-            try:
-                json_obj = json.loads(lines[current_line].strip())
-                format_log_entry(json_obj)
-            except json.JSONDecodeError:
-                # If it's not JSON, print as raw line
-                print(f"📄 原始行: {lines[current_line]}")
-
-            current_line += 1
-            lines_displayed += 1
-
-        if current_line >= total_lines:
-            print("文件结束.")
-            break
-
-        # Wait for user input
-        print("--More--(按空格键翻页，按回车键跳转到下一个时间戳，按 'q' 退出): ", end='', flush=True)
+def find_latest_qwen_jsonl():
+    """Locate the Qwen projects directory and its newest .jsonl in one scan.
 
-        # Read a character from stdin
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(sys.stdin.fileno())
-            ch = sys.stdin.read(1)
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+    Returns (directory_path, file_path, mtime), or (None, None, None) if
+    no log files exist. Replaces the separate directory-detect, latest-file,
+    and existence checks that each walked the same tree at startup.
+    """
+    projects_dir = os.path.join(os.path.expanduser('~'), '.qwen', 'projects')
+    if not os.path.isdir(projects_dir):
+        return None, None, None
 
-        print()  # New line after user input
+    best_path, best_mtime = _latest_file(projects_dir, '.jsonl')
+    if best_path is None:
+        return None, None, None
+    return projects_dir, best_path, best_mtime
 
-        if ch.lower() == 'q':
-            print("退出...")
-            break
-        elif ch == ' ':
-            # Show next page (continue the normal flow)
-            continue
-        elif ch == '\n' or ch == '\r':  # Enter key - jump to next timestamp
-            next_timestamp_idx = find_next_timestamp_index(lines, current_line)
-            if next_timestamp_idx < len(lines):
-                # Display the log entry at the next timestamp position
-                try:
-                    json_obj = json.loads(lines[next_timestamp_idx].strip())
-                    format_log_entry(json_obj)
-                except json.JSONDecodeError:
-                    print(f"📄 原始行: {lines[next_timestamp_idx]}")
-
-                # Update the current line position
-                current_line = next_timestamp_idx + 1
-            else:
-                print("文件结束.")
-                break
-        else:
-            # Any other key - continue normally
-            continue
 
 def get_currently_tracking_file(directory_path=None):
     """Get the currently tracking file path and its inode for change detection"""
@@ -363,21 +606,51 @@ def get_currently_tracking_file(directory_path=None):
     if directory_path is None:
         return None, None
 
-    directory = Path(directory_path)
-
-    # Find all .jsonl files in the directory
-    files = list(directory.rglob("*.jsonl"))
-    if not files:
+    # Most recently modified .jsonl file in the directory
+    latest_file, _ = _latest_file(directory_path, '.jsonl')
+    if latest_file is None:
         return None, None
 
-    # Get the most recently modified file
-    latest_file = max(files, key=lambda f: f.stat().st_mtime)
     try:
-        return str(latest_file), latest_file.stat().st_ino
+        return latest_file, os.stat(latest_file).st_ino
     except (OSError, FileNotFoundError):
         return None, None
 
 
+# Seconds between idle-time rotation checks when no inotify event forces
+# one sooner
+_ROT_TTL = 2.0
+
+def _open_at_end(file_path):
+    """Open a file read-only and position it at the end, returning the fd"""
+    fd = os.open(file_path, os.O_RDONLY)
+    os.lseek(fd, 0, os.SEEK_END)
+    return fd
+
+
+def _make_watcher(directory_path, file_path):
+    """Set up an inotify watcher for the tailed file and its directory.
+
+    Returns (watcher, dir_wd) so the caller can tell directory events
+    (new file created/moved in) apart from file events. Returns
+    (None, -1) when inotify isn't available (non-Linux or package
+    missing), in which case the caller falls back to sleep-based polling.
+    """
+    if INotify is None:
+        return None, -1
+    try:
+        watcher = INotify()
+        dir_wd = -1
+        if directory_path:
+            dir_wd = watcher.add_watch(directory_path,
+                                       inotify_flags.CREATE | inotify_flags.MOVED_TO)
+        watcher.add_watch(file_path,
+                          inotify_flags.MODIFY | inotify_flags.MOVE_SELF | inotify_flags.DELETE_SELF)
+        return watcher, dir_wd
+    except OSError:
+        return None, -1
+
+
 def tail_follow(file_path=None, directory_path=None):
     """Follow a file and output new content as it's appended.
     Automatically detects if Qwen creates a new log file and switches to it.
@@ -386,10 +659,10 @@ def tail_follow(file_path=None, directory_path=None):
     print("Press Ctrl+C to stop")
     print("===========================================")
 
-    # Auto-detect directory if not provided
+    # Auto-detect directory and latest file in a single scan if not provided
     if directory_path is None and file_path is None:
-        directory_path = find_qwen_project_dir()
-        if directory_path is None:
+        directory_path, file_path, _ = find_latest_qwen_jsonl()
+        if file_path is None:
             print("Error: Cannot find Qwen project directory.")
             sys.exit(1)
     elif file_path is None:
@@ -401,16 +674,15 @@ def tail_follow(file_path=None, directory_path=None):
 
     # If file_path is provided but directory_path is not, try to find the directory
     if file_path is not None and directory_path is None:
-        p = Path(file_path)
-        if p.is_file():
-            directory_path = str(p.parent)
+        if os.path.isfile(file_path):
+            directory_path = os.path.dirname(os.path.abspath(file_path))
         else:
             print(f"Error: Cannot determine directory for {file_path}")
             sys.exit(1)
 
     # Get the initial file's inode for change detection
     try:
-        current_inode = Path(file_path).stat().st_ino
+        current_inode = os.stat(file_path).st_ino
     except (OSError, FileNotFoundError):
         print(f"Error: Cannot access {file_path}")
         sys.exit(1)
@@ -420,88 +692,134 @@ def tail_follow(file_path=None, directory_path=None):
 
     # Open file and go to the end initially
     try:
-        f = open(file_path, 'r')
-        f.seek(0, os.SEEK_END)
-    except IOError as e:
+        fd = _open_at_end(file_path)
+    except OSError as e:
         print(f"Error opening file: {e}")
         sys.exit(1)
 
+    # Incomplete trailing line carried over between reads. Completed lines
+    # are sliced off the front as soon as their newline arrives, so the
+    # buffer never grows beyond one partial line plus one read chunk.
+    tail = bytearray()
+
+    # Block on inotify events when available instead of polling at 10Hz
+    watcher, dir_wd = _make_watcher(directory_path, file_path)
+
+    # Throttle the idle-time rotation checks
+    last_rot_check = time.monotonic()
+
+    def _switch_watch():
+        nonlocal watcher, dir_wd
+        if watcher is not None:
+            watcher.close()
+            watcher, dir_wd = _make_watcher(directory_path, file_path)
+
     try:
         while True:
-            line = f.readline()
-            if line:
-                try:
-                    json_obj = json.loads(line.strip())
-                    format_log_entry(json_obj)
-                except json.JSONDecodeError:
-                    # If it's not JSON, print as raw line
-                    print(f"📄 Raw Line: {line.strip()}")
+            chunk = os.read(fd, 65536)
+            if chunk:
+                tail += chunk
+                # Emit every completed line in the buffer
+                while True:
+                    idx = tail.find(b'\n')
+                    if idx < 0:
+                        break
+                    line = bytes(tail[:idx])
+                    del tail[:idx + 1]
+                    try:
+                        json_obj = _loads(line)
+                        format_log_entry(json_obj)
+                    except ValueError:
+                        # If it's not JSON, print as raw line
+                        print(f"📄 Raw Line: {line.decode('utf-8', errors='replace').strip()}")
             else:
-                # No new line from current file, check for new files
-                time.sleep(0.1)
+                # No new data from current file, check for new files
+                rotation_event = False
+                if watcher is not None:
+                    # Sleep until the kernel reports activity (with a
+                    # timeout so the rotation checks below still run).
+                    # A directory event (new file created or moved in)
+                    # or the tailed file itself moving/disappearing
+                    # means the rotation check must run right away;
+                    # plain MODIFY events just wake the read loop.
+                    for event in watcher.read(timeout=1000):
+                        if (event.wd == dir_wd
+                                or event.mask & (inotify_flags.MOVE_SELF
+                                                 | inotify_flags.DELETE_SELF)):
+                            rotation_event = True
+                else:
+                    time.sleep(0.1)
 
-                # Periodically check for newer files (every 10 cycles, ~1 second)
-                check_counter = getattr(tail_follow, 'check_counter', 0)
-                tail_follow.check_counter = check_counter + 1
+                # The rotation checks below are all stat-based; cap them
+                # at one round per _ROT_TTL seconds so an idle tail isn't
+                # issuing syscalls at the poll rate - unless an inotify
+                # event already told us a rotation happened
+                now = time.monotonic()
+                if not rotation_event and now - last_rot_check < _ROT_TTL:
+                    continue
+                last_rot_check = now
 
-                if tail_follow.check_counter >= 10:
-                    tail_follow.check_counter = 0
-                    try:
-                        current_path = Path(file_path)
-                        current_mtime = current_path.stat().st_mtime
-                        # Find the latest .jsonl file in the directory
-                        latest_file_path, _ = get_currently_tracking_file(directory_path)
-                        if latest_file_path and latest_file_path != file_path:
-                            # Check if the latest file is newer than current file
-                            latest_mtime = Path(latest_file_path).stat().st_mtime
-                            if latest_mtime > current_mtime:
-                                print(f"\nDetected newer log file, switching to: {latest_file_path}")
-                                f.close()
-                                file_path = latest_file_path
-                                f = open(file_path, 'r')
-                                f.seek(0, os.SEEK_END)
-                                current_inode = Path(file_path).stat().st_ino
-                    except Exception:
-                        # Ignore errors during file check
-                        pass
+                try:
+                    current_mtime = os.stat(file_path).st_mtime
+                    # Find the latest .jsonl file in the directory
+                    latest_file_path, _ = get_currently_tracking_file(directory_path)
+                    if latest_file_path and latest_file_path != file_path:
+                        # Check if the latest file is newer than current file
+                        latest_mtime = os.stat(latest_file_path).st_mtime
+                        if latest_mtime > current_mtime:
+                            print(f"\nDetected newer log file, switching to: {latest_file_path}")
+                            os.close(fd)
+                            file_path = latest_file_path
+                            fd = _open_at_end(file_path)
+                            current_inode = os.fstat(fd).st_ino
+                            del tail[:]
+                            _switch_watch()
+                except Exception:
+                    # Ignore errors during file check
+                    pass
 
                 # Try to get current file info
                 try:
-                    current_path = Path(file_path)
-                    new_inode = current_path.stat().st_ino
+                    new_inode = os.stat(file_path).st_ino
 
                     # If inode changed, file was replaced
                     if new_inode != current_inode:
                         print(f"\nDetected new log file, switching to: {file_path}")
-                        f.close()
-                        f = open(file_path, 'r')
-                        f.seek(0, os.SEEK_END)
+                        os.close(fd)
+                        fd = _open_at_end(file_path)
                         current_inode = new_inode
+                        del tail[:]
+                        _switch_watch()
                 except (OSError, FileNotFoundError):
                     # File was deleted or moved, look for new log file
                     print(f"\nLog file rotated, finding new log file...")
-                    f.close()
-
-                    # Look for the latest .jsonl file in the directory
-                    new_file_path, new_inode = get_currently_tracking_file(directory_path)
-                    if new_file_path and new_file_path != file_path:
-                        print(f"Switching to new log file: {new_file_path}")
-                        file_path = new_file_path
-                        f = open(file_path, 'r')
-                        f.seek(0, os.SEEK_END)
-                        current_inode = new_inode
-                    elif new_file_path:
-                        # Same file, just wait
-                        pass  # Already waited above
-                    else:
-                        # No log file found, wait and retry
-                        time.sleep(1)
+                    os.close(fd)
+                    fd = -1
+
+                    # Look for the latest .jsonl file in the directory,
+                    # retrying until one can be opened
+                    while fd < 0:
+                        new_file_path, new_inode = get_currently_tracking_file(directory_path)
+                        if new_file_path:
+                            if new_file_path != file_path:
+                                print(f"Switching to new log file: {new_file_path}")
+                                file_path = new_file_path
+                            try:
+                                fd = _open_at_end(file_path)
+                                current_inode = new_inode
+                                del tail[:]
+                                _switch_watch()
+                            except OSError:
+                                time.sleep(1)
+                        else:
+                            # No log file found, wait and retry
+                            time.sleep(1)
 
-    except KeyboardInterrupt:
-        f.close()
-        raise
     finally:
-        f.close()
+        if fd >= 0:
+            os.close(fd)
+        if watcher is not None:
+            watcher.close()
 
 def main():
     parser = argparse.ArgumentParser(description='Format and display log files with pagination or follow mode.')
@@ -517,28 +835,27 @@ def main():
             if os.path.isdir(args.logfile):
                 # Directory provided, monitor for new files in it
                 directory_path = args.logfile
-                file_path = None  # Will be auto-detected
+                file_path, _ = get_currently_tracking_file(directory_path)
+                if file_path is None:
+                    print(f"Error: No .jsonl files found in {directory_path}")
+                    sys.exit(1)
             else:
                 # Specific file provided
                 file_path = args.logfile
                 directory_path = None
+        elif args.directory:
+            directory_path = args.directory
+            file_path, _ = get_currently_tracking_file(directory_path)
+            if file_path is None:
+                print(f"Error: No .jsonl files found in {directory_path}")
+                sys.exit(1)
         else:
-            # Auto-detect
-            file_path = None
-            directory_path = args.directory or find_qwen_project_dir()
-            if directory_path is None:
+            # Auto-detect directory and latest file in one scan
+            directory_path, file_path, _ = find_latest_qwen_jsonl()
+            if file_path is None:
                 print("Error: Cannot find Qwen project directory.")
                 sys.exit(1)
 
-        if not os.path.exists(file_path) if file_path else True:
-            # Check if directory has any .jsonl files
-            test_dir = directory_path or (find_qwen_project_dir() if not args.directory else args.directory)
-            if test_dir:
-                jsonl_files = list(Path(test_dir).rglob("*.jsonl"))
-                if not jsonl_files:
-                    print(f"Error: No .jsonl files found in {test_dir}")
-                    sys.exit(1)
-
         try:
             tail_follow(file_path=file_path, directory_path=directory_path)
         except KeyboardInterrupt:
@@ -560,10 +877,7 @@ def main():
             sys.exit(1)
 
         try:
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
-
-            paginate_output(lines)
+            paginate_output(file_path)
             print("End of file reached.")
         except KeyboardInterrupt:
             print("\nExiting...")